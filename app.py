@@ -1,9 +1,6 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import requests
-from bs4 import BeautifulSoup
 import re
 import nltk
 from datetime import datetime
@@ -26,13 +23,23 @@ st.set_page_config(
 # -------------------------
 # Download NLTK data
 # -------------------------
-for resource in ["punkt", "punkt_tab"]:
-    try:
-        nltk.data.find(f"tokenizers/{resource}")
-    except LookupError:
-        with st.spinner(f"Downloading {resource}..."):
+@st.cache_resource(show_spinner="Checking NLTK data...")
+def ensure_nltk_data():
+    """Look up (and download if missing) tokenizer data once per process"""
+    for resource in ["punkt", "punkt_tab"]:
+        try:
+            nltk.data.find(f"tokenizers/{resource}")
+        except LookupError:
             nltk.download(resource)
 
+@st.cache_resource
+def load_sentence_tokenizer():
+    """Build the NLTK sentence tokenizer once instead of on every call"""
+    ensure_nltk_data()
+    return nltk.tokenize.PunktTokenizer("english")
+
+ensure_nltk_data()
+
 # -------------------------
 # Custom CSS (Enhanced UI)
 # -------------------------
@@ -114,21 +121,41 @@ class FakeNewsDetector:
         X_train = self.vectorizer.fit_transform(train_texts)
         self.clf = MultinomialNB()
         self.clf.fit(X_train, train_labels)
+        classes = list(self.clf.classes_)
+        self.fake_idx = classes.index("fake")
+        self.reliable_idx = classes.index("reliable")
+        # Naive Bayes scoring is one sparse dot plus the class priors
+        self.feature_log_prob = self.clf.feature_log_prob_.T
+        self.class_log_prior = self.clf.class_log_prior_
+
+        self.sent_tokenizer = load_sentence_tokenizer()
+
+        # Each pattern matches a whole word containing any of the keywords
+        sensational_words = ['shocking','miracle','secret','breaking','urgent','fraud','scandal']
+        reliable_indicators = ['according','research','study','experts','official','confirmed']
+        self.sensational_re = re.compile(r"\b\w*?(?:%s)\w*" % "|".join(map(re.escape, sensational_words)), re.I)
+        self.reliable_re = re.compile(r"\b\w*?(?:%s)\w*" % "|".join(map(re.escape, reliable_indicators)), re.I)
 
     def analyze_text(self, text):
         """Analyze text for fake news indicators"""
         if len(text) < 20:
             return {'error': 'Text too short for analysis'}
-        
-        summary = self.generate_summary(text)
+        return analyze_text_cached(self, text)
+
+    def run_analysis(self, text):
+        """Uncached analysis pipeline behind analyze_text"""
+        # Tokenize once and share the results between summary and features
+        sentences = self.sent_tokenizer.tokenize(text)
+        words = text.split()
+        summary = self.generate_summary(text, sentences)
         analysis = self.model_based_analysis(text)
-        features = self.extract_features(text)
+        features = self.extract_features(text, sentences, words)
         
         return {
             'summary': summary,
             'analysis': analysis,
             'features': features,
-            'word_count': len(text.split()),
+            'word_count': len(words),
             'char_count': len(text)
         }
 
@@ -136,23 +163,27 @@ class FakeNewsDetector:
         """Offline ML-based Fake/Real detection"""
         try:
             X_test = self.vectorizer.transform([text])
-            pred = self.clf.predict(X_test)[0]
-            prob = self.clf.predict_proba(X_test)[0]
+            logits = (X_test @ self.feature_log_prob)[0] + self.class_log_prior
+            prob = np.exp(logits - logits.max())
+            prob /= prob.sum()
 
-            if pred == "fake":
+            fake_score = prob[self.fake_idx]
+            reliable_score = prob[self.reliable_idx]
+
+            if prob.argmax() == self.fake_idx:
                 verdict, color = "Fake News", "red"
-                confidence = prob[self.clf.classes_.tolist().index("fake")]
+                confidence = fake_score
             else:
                 verdict, color = "Reliable", "green"
-                confidence = prob[self.clf.classes_.tolist().index("reliable")]
+                confidence = reliable_score
 
             return {
                 "verdict": verdict,
                 "confidence": float(confidence),
                 "color": color,
                 "scores": {
-                    "fake_score": float(prob[self.clf.classes_.tolist().index("fake")]),
-                    "reliable_score": float(prob[self.clf.classes_.tolist().index("reliable")])
+                    "fake_score": float(fake_score),
+                    "reliable_score": float(reliable_score)
                 }
             }
         except Exception as e:
@@ -167,43 +198,28 @@ class FakeNewsDetector:
     def extract_article_from_url(self, url):
         """Extract article content from URL"""
         try:
-            headers = {'User-Agent':'Mozilla/5.0'}
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            title = soup.find('title')
-            title_text = title.get_text() if title else "No title found"
-            
-            content = ""
-            article = soup.find('article')
-            if article:
-                content = article.get_text()
-            else:
-                paragraphs = soup.find_all('p')
-                content = ' '.join([p.get_text() for p in paragraphs])
-            content = re.sub(r'\s+', ' ', content).strip()
-            
-            return {'title': title_text, 'content': content, 'success': len(content) > 100}
+            return fetch_article_cached(url)
         except Exception as e:
             return {'title': 'Error', 'content':'', 'success': False, 'error': str(e)}
 
-    def generate_summary(self, text):
+    def generate_summary(self, text, sentences=None):
         """Extractive summary"""
         if not text or len(text) < 100: 
             return "Text too short for meaningful summary"
         try:
-            sentences = nltk.sent_tokenize(text)
+            if sentences is None:
+                sentences = self.sent_tokenizer.tokenize(text)
             return ' '.join(sentences[:3]) if len(sentences) > 3 else ' '.join(sentences)
         except Exception as e:
             return f"(Summary unavailable: {e})"
 
-    def extract_features(self, text):
-        words = nltk.word_tokenize(text.lower())
-        sentences = nltk.sent_tokenize(text)
-        sensational_words = ['shocking','miracle','secret','breaking','urgent','fraud','scandal']
-        sensational_count = sum(1 for word in words if any(sw in word for sw in sensational_words))
-        reliable_indicators = ['according','research','study','experts','official','confirmed']
-        reliable_count = sum(1 for word in words if any(rw in word for rw in reliable_indicators))
+    def extract_features(self, text, sentences=None, words=None):
+        if words is None:
+            words = text.split()
+        if sentences is None:
+            sentences = self.sent_tokenizer.tokenize(text)
+        sensational_count = len(self.sensational_re.findall(text))
+        reliable_count = len(self.reliable_re.findall(text))
         return {
             'word_count': len(words),
             'sentence_count': len(sentences),
@@ -214,12 +230,66 @@ class FakeNewsDetector:
         }
 
 # -------------------------
-# Initialize detector in session
+# Cached helpers
 # -------------------------
-if "detector" not in st.session_state:
-    st.session_state.detector = FakeNewsDetector()
+# Larger pages are truncated before parsing. urllib3>=2 is required so that
+# raw.read(amt, decode_content=True) caps decoded, not compressed, bytes.
+MAX_ARTICLE_BYTES = 2_000_000
+WHITESPACE_RE = re.compile(r'\s+')
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def analyze_text_cached(_detector, text):
+    """Memoize analysis results per input text (the detector is not hashed)"""
+    return _detector.run_analysis(text)
+
+@st.cache_resource
+def get_http_session():
+    """Shared keep-alive session so repeat hosts skip the TCP/TLS handshake"""
+    import requests  # deferred: only URL analysis needs it
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=10)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({'User-Agent':'Mozilla/5.0'})
+    return session
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_article_cached(url):
+    """Download and parse an article; errors propagate so they are not cached"""
+    from bs4 import BeautifulSoup  # deferred: only URL analysis needs it
+    with get_http_session().get(url, timeout=10, stream=True) as response:
+        response.raise_for_status()
+        raw = response.raw.read(MAX_ARTICLE_BYTES, decode_content=True)
+    soup = BeautifulSoup(raw, 'lxml')
+    
+    title = soup.find('title')
+    title_text = title.get_text() if title else "No title found"
+    
+    # get_text(' ', strip=True) trims each text node while walking the tree,
+    # leaving one pass to collapse whitespace runs (e.g. from empty <p>s)
+    article = soup.find('article')
+    if article:
+        content = article.get_text(' ', strip=True)
+    else:
+        content = ' '.join(p.get_text(' ', strip=True) for p in soup.find_all('p'))
+    content = WHITESPACE_RE.sub(' ', content).strip()
+    
+    return {'title': title_text, 'content': content, 'success': len(content) > 100}
+
+# -------------------------
+# Shared detector and per-session state
+# -------------------------
+@st.cache_resource
+def get_detector():
+    """Train the detector once per process and share it across sessions"""
+    return FakeNewsDetector()
+
+MAX_HISTORY = 50  # oldest entries are dropped beyond this
+
 if "analysis_history" not in st.session_state:
     st.session_state.analysis_history = []
+if "analysis_count" not in st.session_state:
+    st.session_state.analysis_count = 0
 
 # -------------------------
 # Streamlit pages
@@ -254,7 +324,7 @@ def render_analysis_page():
     if analyze_btn and input_content:
         with st.spinner("Analyzing..."):
             if input_method == "🌐 Enter URL":
-                result = st.session_state.detector.extract_article_from_url(input_content)
+                result = get_detector().extract_article_from_url(input_content)
                 if not result['success']:
                     st.error("Failed to extract content")
                     return
@@ -264,12 +334,20 @@ def render_analysis_page():
                 article_title = "Pasted Text Analysis"
                 article_content = input_content
 
-            analysis_result = st.session_state.detector.analyze_text(article_content)
+            analysis_result = get_detector().analyze_text(article_content)
             if 'error' in analysis_result:
                 st.error(analysis_result['error'])
                 return
             full_result = {'timestamp': datetime.now().isoformat(), 'title': article_title, **analysis_result}
-            st.session_state.analysis_history.append(full_result)
+            # Keep only what the History page shows, not the article text
+            st.session_state.analysis_history.append({
+                'timestamp': full_result['timestamp'],
+                'title': article_title,
+                'analysis': analysis_result['analysis'],
+                'word_count': analysis_result['word_count']
+            })
+            st.session_state.analysis_history = st.session_state.analysis_history[-MAX_HISTORY:]
+            st.session_state.analysis_count += 1
             display_results(full_result)
 
 def display_results(result):
@@ -297,16 +375,15 @@ def display_results(result):
         """, unsafe_allow_html=True)
         
         st.write("### 🧮 Score Breakdown")
-        scores = analysis['scores']
-        fig = px.pie(
-            names=list(scores.keys()), 
-            values=list(scores.values()), 
-            color=list(scores.keys()), 
-            color_discrete_map={'fake_score':'red','reliable_score':'green'},
-            hole=0.4
-        )
-        fig.update_traces(textinfo='label+percent', pull=[0.05, 0.05])
-        st.plotly_chart(fig, use_container_width=True)
+        fake = analysis['scores']['fake_score']
+        reliable = analysis['scores']['reliable_score']
+        st.markdown(f"""
+        <div style="display:flex;height:20px;border-radius:10px;overflow:hidden;">
+            <div style="background:red;width:{fake:.1%};"></div>
+            <div style="background:green;width:{reliable:.1%};"></div>
+        </div>
+        <p>🔴 Fake: <b>{fake:.1%}</b> &nbsp; 🟢 Reliable: <b>{reliable:.1%}</b></p>
+        """, unsafe_allow_html=True)
 
 def render_history_page():
     st.title("📈 Analysis History")
@@ -359,7 +436,7 @@ def main():
         st.markdown("---")
         page = st.radio("Choose a page:", ["🏘️ Home", "📰 Analyze Article", "📚 History", "🎓 Learn"])
         st.markdown("---")
-        st.metric("Analyses", len(st.session_state.analysis_history))
+        st.metric("Analyses", st.session_state.analysis_count)
     
     if page == "🏘️ Home": render_home_page()
     elif page == "📰 Analyze Article": render_analysis_page()